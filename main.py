@@ -2,31 +2,37 @@
 import sys
 
 from src.cli.interface import CommandLineInterface
-from src.services.loader import ImageLibraryLoader
-from src.services.search_engine import SearchEngine
-
+from src.services.federated_search import FederatedSearchEngine
+from src.services.loader import expand_csv_paths
 
 def main() -> None:
     cli = CommandLineInterface()
     args = cli.parse_args()
 
     try:
-        # Load image library
-        loader = ImageLibraryLoader(args.csv)
-        images = loader.load()
+        # Resolve CSV shards
+        paths = expand_csv_paths(args.csv)
 
         # Create search criteria
         criteria = cli.create_search_criteria(args)
 
-        # Perform search
-        search_engine = SearchEngine(images)
-        results = search_engine.search(criteria)
-
-        # Display results
-        cli.display_results(results, len(images), args.verbose)
-
-    except FileNotFoundError:
-        print(f"Error: CSV file '{args.csv}' not found.")
+        # Load and index every shard once, then search them
+        with FederatedSearchEngine(
+            paths, args.workers, args.parallel_threshold
+        ) as search_engine:
+            results = search_engine.search(criteria)
+
+            # Display results
+            cli.display_results(
+                results,
+                search_engine.records_loaded,
+                args.verbose,
+                criteria.near,
+                search_engine.shard_results,
+            )
+
+    except FileNotFoundError as e:
+        print(f"Error: File '{e.filename or ' '.join(args.csv)}' not found.")
         sys.exit(1)
     except Exception as e:
         print(f"Error: {e}")
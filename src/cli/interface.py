@@ -1,8 +1,11 @@
 import argparse
+from typing import Optional
 
 from ..models.image_metadata import ImageMetadata
 from ..models.search_criteria import SearchCriteria
-
+from ..services.federated_search import ShardResult
+from ..services.geospatial import haversine_km
+from ..services.search_engine import DEFAULT_PARALLEL_THRESHOLD
 
 class CommandLineInterface:
     def __init__(self) -> None:
@@ -12,8 +15,22 @@ class CommandLineInterface:
         parser = argparse.ArgumentParser(description="Search image library")
         parser.add_argument(
             "--csv",
-            default="image_library.csv",
-            help="Path to CSV file (default: image_library.csv)",
+            nargs="+",
+            default=["image_library.csv"],
+            help="Paths or glob patterns of CSV shards (default: image_library.csv)",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            help="Worker processes for loading and searching shards, or for "
+            "scanning a single large library in parallel (default: CPU count)",
+        )
+        parser.add_argument(
+            "--parallel-threshold",
+            type=int,
+            default=DEFAULT_PARALLEL_THRESHOLD,
+            help="Minimum images in a single library before searching it in parallel "
+            f"(default: {DEFAULT_PARALLEL_THRESHOLD})",
         )
         parser.add_argument(
             "--tag",
@@ -24,6 +41,28 @@ class CommandLineInterface:
         parser.add_argument(
             "--polygon", help='Polygon coordinates as "lat1,lon1 lat2,lon2 lat3,lon3"'
         )
+        parser.add_argument(
+            "--polygon-file",
+            help="Path to a GeoJSON file with a Polygon or MultiPolygon "
+            "(holes supported)",
+        )
+        parser.add_argument(
+            "--near",
+            metavar="LAT,LON",
+            help="Search centre for distance queries. Use the --near=LAT,LON form: "
+            "a value starting with '-' (southern latitudes) is otherwise read as "
+            "an option",
+        )
+        parser.add_argument(
+            "--radius",
+            type=float,
+            help="Maximum distance in km from --near",
+        )
+        parser.add_argument(
+            "--nearest",
+            type=int,
+            help="Return the K images closest to --near",
+        )
         parser.add_argument(
             "--verbose",
             "-v",
@@ -38,6 +77,15 @@ class CommandLineInterface:
     def create_search_criteria(self, args: argparse.Namespace) -> SearchCriteria:
         criteria = SearchCriteria()
 
+        # Validate execution options
+        if args.workers is not None and args.workers < 1:
+            raise ValueError(f"Invalid worker count: {args.workers} (must be >= 1)")
+        if args.parallel_threshold < 0:
+            raise ValueError(
+                f"Invalid parallel threshold: {args.parallel_threshold} "
+                "(must be >= 0)"
+            )
+
         # Parse tag criteria
         if args.tag:
             for tag_expr in args.tag:
@@ -54,6 +102,24 @@ class CommandLineInterface:
             coords = self._parse_polygon(args.polygon)
             criteria.set_polygon(coords)
 
+        if args.polygon_file:
+            criteria.set_polygon_file(args.polygon_file)
+
+        # Parse distance query
+        if args.near:
+            if args.radius is None and args.nearest is None:
+                raise ValueError("--near requires --radius and/or --nearest")
+            if args.radius is not None and not args.radius >= 0:
+                raise ValueError(f"Invalid radius: {args.radius} (must be >= 0 km)")
+            if args.nearest is not None and args.nearest < 1:
+                raise ValueError(
+                    f"Invalid nearest count: {args.nearest} (must be >= 1)"
+                )
+            lat, lon = self._parse_coordinate(args.near)
+            criteria.set_near(lat, lon, args.radius, args.nearest)
+        elif args.radius is not None or args.nearest is not None:
+            raise ValueError("--radius and --nearest require --near")
+
         return criteria
 
     def _parse_tag_expression(self, expr: str) -> tuple[str, str, str]:
@@ -82,8 +148,26 @@ class CommandLineInterface:
             coords.append((float(lat), float(lon)))
         return coords
 
+    def _parse_coordinate(self, coord_str: str) -> tuple[float, float]:
+        try:
+            lat_str, lon_str = coord_str.split(",")
+            lat, lon = float(lat_str), float(lon_str)
+        except ValueError:
+            raise ValueError(f"Invalid coordinate: {coord_str}")
+        if not -90.0 <= lat <= 90.0 or not -180.0 <= lon <= 180.0:
+            raise ValueError(
+                f"Invalid coordinate: {coord_str} "
+                "(latitude must be within [-90, 90], longitude within [-180, 180])"
+            )
+        return lat, lon
+
     def display_results(
-        self, results: list[ImageMetadata], total_loaded: int, verbose: bool = False
+        self,
+        results: list[ImageMetadata],
+        total_loaded: int,
+        verbose: bool = False,
+        near: Optional[tuple[float, float]] = None,
+        shards: Optional[list[ShardResult]] = None,
     ) -> None:
         if verbose:
             if not results:
@@ -100,6 +184,8 @@ class CommandLineInterface:
                     coords = image.get_coordinates()
                     if coords:
                         print(f"  Coordinates: {coords[0]:.5f}, {coords[1]:.5f}")
+                        if near:
+                            print(f"  Distance: {haversine_km(near, coords):.2f} km")
 
                     # Show user tags if available
                     if image.tags:
@@ -110,3 +196,14 @@ class CommandLineInterface:
         print(f"\nSummary:")
         print(f"Records loaded: {total_loaded}")
         print(f"Records found: {len(results)}")
+
+        # Per-shard breakdown when searching more than one file
+        if shards and len(shards) > 1:
+            print(f"\nShards: {len(shards)}")
+            for shard in shards:
+                print(
+                    f"- {shard.path}: loaded {shard.records_loaded}, "
+                    f"found {shard.records_found} "
+                    f"(load {shard.load_seconds:.3f}s, "
+                    f"search {shard.search_seconds:.3f}s)"
+                )
@@ -5,6 +5,8 @@ class ImageMetadata:
     def __init__(self, **kwargs: Any) -> None:
         self.data: dict[str, Any] = kwargs
         self.tags: list[str] = self._parse_tags(kwargs.get("User Tags", ""))
+        self._coordinates: Optional[tuple[float, float]] = None
+        self._coordinates_parsed = False
 
     def _parse_tags(self, tag_string: str) -> list[str]:
         if not tag_string:
@@ -49,6 +51,13 @@ class ImageMetadata:
         return tag.lower() in [t.lower() for t in self.tags]
 
     def get_coordinates(self) -> Optional[tuple[float, float]]:
+        # Parse once; searches and the spatial index call this repeatedly
+        if not self._coordinates_parsed:
+            self._coordinates = self._parse_coordinates()
+            self._coordinates_parsed = True
+        return self._coordinates
+
+    def _parse_coordinates(self) -> Optional[tuple[float, float]]:
         coord_str = self.get("(Center) Coordinate", "")
         if not coord_str:
             return None
@@ -9,7 +9,11 @@ class SearchCriteria:
         self.polygon: Optional[list[tuple[float, float]]] = (
             None  # List of (lat, lon) tuples
         )
+        self.polygon_file: Optional[str] = None  # Path to a GeoJSON polygon file
         self.user_tags: list[str] = []  # List of user tags to match
+        self.near: Optional[tuple[float, float]] = None  # (lat, lon) search centre
+        self.radius_km: Optional[float] = None  # Maximum distance from near
+        self.nearest: Optional[int] = None  # Number of closest images to return
 
     def add_tag_criterion(self, field: str, operator: str, value: str) -> None:
         self.tag_criteria.append((field, operator, value))
@@ -19,3 +23,17 @@ class SearchCriteria:
 
     def set_polygon(self, coordinates: list[tuple[float, float]]) -> None:
         self.polygon = coordinates
+
+    def set_polygon_file(self, path: str) -> None:
+        self.polygon_file = path
+
+    def set_near(
+        self,
+        lat: float,
+        lon: float,
+        radius_km: Optional[float] = None,
+        nearest: Optional[int] = None,
+    ) -> None:
+        self.near = (lat, lon)
+        self.radius_km = radius_km
+        self.nearest = nearest
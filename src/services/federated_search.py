@@ -0,0 +1,209 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+from ..models.image_metadata import ImageMetadata
+from ..models.search_criteria import SearchCriteria
+from .geospatial import PreparedPolygon, haversine_km
+from .loader import ImageLibraryLoader
+from .search_engine import DEFAULT_PARALLEL_THRESHOLD, SearchEngine
+
+
+class ShardResult:
+    def __init__(
+        self,
+        path: str,
+        records_loaded: int,
+        results: list[ImageMetadata],
+        load_seconds: float,
+        search_seconds: float,
+    ) -> None:
+        self.path = path
+        self.records_loaded = records_loaded
+        self.results = results
+        self.load_seconds = load_seconds
+        self.search_seconds = search_seconds
+
+    @property
+    def records_found(self) -> int:
+        return len(self.results)
+
+
+class LoadedShard:
+    """A CSV shard loaded into memory with its own (index-caching) SearchEngine."""
+
+    def __init__(
+        self,
+        path: str,
+        workers: int = 1,
+        parallel_threshold: int = DEFAULT_PARALLEL_THRESHOLD,
+    ) -> None:
+        start = time.perf_counter()
+        images = ImageLibraryLoader(path).load()
+        self.path = path
+        self.engine = SearchEngine(images, workers, parallel_threshold)
+        self.records_loaded = len(images)
+        self.load_seconds = time.perf_counter() - start
+
+    def search(
+        self, criteria: SearchCriteria, polygons: list[PreparedPolygon]
+    ) -> ShardResult:
+        start = time.perf_counter()
+        results = self.engine.search(criteria, polygons)
+        return ShardResult(
+            self.path,
+            self.records_loaded,
+            results,
+            self.load_seconds,
+            time.perf_counter() - start,
+        )
+
+    def close(self) -> None:
+        self.engine.close()
+
+
+# Shards owned by the current worker process; they stay loaded (with their
+# spatial indexes and column stores) for every later search
+_worker_shards: list[LoadedShard] = []
+
+
+def _load_worker_shards(paths: list[str]) -> list[tuple[int, float]]:
+    for path in paths:
+        _worker_shards.append(LoadedShard(path))
+    return [(shard.records_loaded, shard.load_seconds) for shard in _worker_shards]
+
+
+def _search_worker_shards(criteria: SearchCriteria) -> list[ShardResult]:
+    # Only the criteria cross the process boundary; polygons are compiled
+    # here once per worker and shared by all of its shards
+    polygons = SearchEngine.prepare_polygons(criteria)
+    return [shard.search(criteria, polygons) for shard in _worker_shards]
+
+
+class FederatedSearchEngine:
+    """
+    Search a library split across several CSV shards.
+
+    load() spreads the shards over long-lived worker processes (largest files
+    first, onto the least loaded worker), which load and index them
+    concurrently and keep them in memory. Each search() then only sends the
+    criteria to the workers. A lone shard is kept in-process and uses the
+    workers for parallel row-range scans instead.
+
+    Results are merged in shard order, then row order within each shard, so
+    output is stable regardless of which worker finishes first. Distance
+    queries are re-ordered by distance across all shards. Call close() (or
+    use the engine as a context manager) to stop the workers.
+    """
+
+    def __init__(
+        self,
+        paths: list[str],
+        max_workers: Optional[int] = None,
+        parallel_threshold: int = DEFAULT_PARALLEL_THRESHOLD,
+    ) -> None:
+        self.paths = paths
+        if max_workers is not None and max_workers < 1:
+            raise ValueError(f"Invalid worker count: {max_workers} (must be >= 1)")
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.parallel_threshold = parallel_threshold
+        self.shard_results: list[ShardResult] = []
+        self.records_loaded = 0
+        self._loaded = False
+        self._local_shards: list[LoadedShard] = []
+        self._executors: list[ProcessPoolExecutor] = []
+        self._assignments: list[list[int]] = []
+
+    def __enter__(self) -> "FederatedSearchEngine":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        for executor in self._executors:
+            executor.shutdown()
+        for shard in self._local_shards:
+            shard.close()
+        self._executors = []
+        self._assignments = []
+        self._local_shards = []
+        self._loaded = False
+
+    def load(self) -> None:
+        if self._loaded:
+            return
+
+        workers = min(self.max_workers, len(self.paths))
+        try:
+            if len(self.paths) == 1:
+                self._local_shards = [
+                    LoadedShard(
+                        self.paths[0], self.max_workers, self.parallel_threshold
+                    )
+                ]
+            elif workers <= 1:
+                self._local_shards = [LoadedShard(path) for path in self.paths]
+            else:
+                self._start_workers(workers)
+        except BaseException:
+            self.close()
+            raise
+
+        if self._local_shards:
+            self.records_loaded = sum(s.records_loaded for s in self._local_shards)
+        self._loaded = True
+
+    def _start_workers(self, workers: int) -> None:
+        # Balance by file size: biggest shards first, each to the least
+        # loaded worker; shards keep their original index for merging
+        sizes = [os.path.getsize(path) for path in self.paths]
+        loads = [0] * workers
+        self._assignments = [[] for _ in range(workers)]
+        for index in sorted(range(len(self.paths)), key=lambda i: -sizes[i]):
+            worker = loads.index(min(loads))
+            self._assignments[worker].append(index)
+            loads[worker] += sizes[index]
+
+        # One single-process pool per worker pins each shard to its process
+        self._executors = [ProcessPoolExecutor(max_workers=1) for _ in range(workers)]
+        futures = [
+            executor.submit(_load_worker_shards, [self.paths[i] for i in indices])
+            for executor, indices in zip(self._executors, self._assignments)
+        ]
+        self.records_loaded = sum(
+            records for future in futures for records, _ in future.result()
+        )
+
+    def search(self, criteria: SearchCriteria) -> list[ImageMetadata]:
+        # Compile polygons before loading any shard so a missing or malformed
+        # polygon file fails fast; workers compile their own copy
+        polygons = SearchEngine.prepare_polygons(criteria)
+        self.load()
+
+        if self._local_shards:
+            self.shard_results = [
+                shard.search(criteria, polygons) for shard in self._local_shards
+            ]
+        else:
+            futures = [
+                executor.submit(_search_worker_shards, criteria)
+                for executor in self._executors
+            ]
+            ordered: list[Optional[ShardResult]] = [None] * len(self.paths)
+            for future, indices in zip(futures, self._assignments):
+                for index, shard_result in zip(indices, future.result()):
+                    ordered[index] = shard_result
+            self.shard_results = [result for result in ordered if result is not None]
+
+        results = [image for shard in self.shard_results for image in shard.results]
+
+        if criteria.near:
+            # Each shard returns its own closest matches; pick the overall best
+            near = criteria.near
+            results.sort(key=lambda image: haversine_km(near, image.get_coordinates()))
+            if criteria.nearest is not None:
+                results = results[: criteria.nearest]
+
+        return results
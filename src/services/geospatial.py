@@ -1,3 +1,22 @@
+import json
+import math
+from bisect import bisect_left, bisect_right
+from typing import Any, Iterator, Optional
+
+EARTH_RADIUS_KM = 6371.0088
+
+
+def haversine_km(point1: tuple[float, float], point2: tuple[float, float]) -> float:
+    """Great-circle distance in kilometres between two (lat, lon) points."""
+    lat1, lon1 = map(math.radians, point1)
+    lat2, lon2 = map(math.radians, point2)
+    a = (
+        math.sin((lat2 - lat1) / 2) ** 2
+        + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
 def point_in_polygon(
     point: tuple[float, float], polygon: list[tuple[float, float]]
 ) -> bool:
@@ -49,3 +68,182 @@ def point_in_polygon(
         p1x, p1y = p2x, p2y
 
     return inside
+
+
+class PreparedPolygon:
+    """
+    A (multi)polygon compiled for fast, repeated point-in-polygon tests.
+
+    Each part is a list of rings: the outer boundary first, followed by any
+    holes. Containment follows the same ray casting rules as
+    point_in_polygon (even-odd across all rings of a part), and a point is
+    inside the geometry when it is inside any part.
+
+    Preprocessing:
+    - The overall bounding box rejects far-away points immediately
+    - The y-axis is cut into slabs at the vertex y-coordinates and every edge
+      is bucketed into the slabs it spans. When long edges would be copied
+      into too many slabs, neighbouring slabs are merged until the total
+      number of slab entries is at most max_duplication per edge
+    - Within a slab, edges are sorted by their rightmost x-coordinate
+    - A test binary-searches the slab holding the point's y-coordinate, then
+      binary-searches past the edges that lie entirely to the left of the
+      point, and only ray casts against the remaining edges
+    """
+
+    def __init__(
+        self,
+        parts: list[list[list[tuple[float, float]]]],
+        max_duplication: int = 16,
+    ) -> None:
+        edges = []
+        for part_index, rings in enumerate(parts):
+            for ring in rings:
+                n = len(ring)
+                for i in range(n):
+                    p1x, p1y = ring[i]
+                    p2x, p2y = ring[(i + 1) % n]
+                    # Horizontal edges can never be crossed by the ray
+                    if p1y != p2y:
+                        edges.append((p1x, p1y, p2x, p2y, part_index))
+
+        self.part_count = len(parts)
+        self.edge_count = len(edges)
+        self.bounds: Optional[tuple[float, float, float, float]] = None
+        self._boundaries: list[float] = []
+        self._slabs: list[list[tuple[float, float, float, float, int]]] = []
+        self._slab_keys: list[list[float]] = []
+
+        if not edges:
+            return
+
+        xs = [c for e in edges for c in (e[0], e[2])]
+        ys = sorted({c for e in edges for c in (e[1], e[3])})
+        self.bounds = (min(xs), ys[0], max(xs), ys[-1])
+
+        # Start with one slab per distinct y-coordinate and merge slabs
+        # (doubling the step) until edge duplication fits the budget
+        budget = max_duplication * len(edges)
+        step = 1
+        while True:
+            boundaries = ys[::step]
+            if boundaries[-1] != ys[-1]:
+                boundaries.append(ys[-1])
+            spans = [self._slab_span(boundaries, edge) for edge in edges]
+            if (
+                step >= len(ys)
+                or sum(last - first + 1 for first, last in spans) <= budget
+            ):
+                break
+            step *= 2
+        self._boundaries = boundaries
+
+        # Slab i covers the half-open interval (boundaries[i], boundaries[i+1]]
+        self._slabs = [[] for _ in range(len(boundaries) - 1)]
+        for edge, (first, last) in zip(edges, spans):
+            for slab in range(first, last + 1):
+                self._slabs[slab].append(edge)
+
+        for slab_edges in self._slabs:
+            slab_edges.sort(key=lambda e: max(e[0], e[2]))
+        self._slab_keys = [
+            [max(e[0], e[2]) for e in slab_edges] for slab_edges in self._slabs
+        ]
+
+    @staticmethod
+    def _slab_span(
+        boundaries: list[float], edge: tuple[float, float, float, float, int]
+    ) -> tuple[int, int]:
+        y_min = min(edge[1], edge[3])
+        y_max = max(edge[1], edge[3])
+        first = max(bisect_right(boundaries, y_min) - 1, 0)
+        last = bisect_left(boundaries, y_max) - 1
+        return first, last
+
+    def _candidates(
+        self, point: tuple[float, float]
+    ) -> tuple[list[tuple[float, float, float, float, int]], int]:
+        # Edges of the point's slab from the returned index onwards reach at
+        # least as far right as the point; all others cannot be crossed
+        x, y = point
+        slab = bisect_left(self._boundaries, y) - 1
+        if slab < 0 or slab >= len(self._slabs):
+            return [], 0
+        return self._slabs[slab], bisect_left(self._slab_keys[slab], x)
+
+    @classmethod
+    def from_coordinates(
+        cls, polygon: list[tuple[float, float]], max_duplication: int = 16
+    ) -> "PreparedPolygon":
+        """Compile a single ring, as accepted by point_in_polygon."""
+        return cls([[polygon]], max_duplication)
+
+    def contains(self, point: tuple[float, float]) -> bool:
+        if self.bounds is None:
+            return False
+
+        x, y = point
+        min_x, min_y, max_x, max_y = self.bounds
+        # Bounding box rejection (the ray only travels towards +x)
+        if y <= min_y or y > max_y or x > max_x:
+            return False
+
+        slab_edges, start = self._candidates(point)
+        # Parts the ray has crossed an odd number of times
+        inside: set[int] = set()
+        for index in range(start, len(slab_edges)):
+            p1x, p1y, p2x, p2y, part_index = slab_edges[index]
+            # Same crossing rules as point_in_polygon
+            if y > min(p1y, p2y) and y <= max(p1y, p2y):
+                if p1x == p2x or x <= (y - p1y) * (p2x - p1x) / (p2y - p1y) + p1x:
+                    inside ^= {part_index}
+
+        return bool(inside)
+
+
+def load_geojson_polygon(path: str) -> PreparedPolygon:
+    """
+    Load a Polygon or MultiPolygon from a GeoJSON file.
+
+    Accepts a bare geometry, a Feature, a FeatureCollection or a
+    GeometryCollection. All polygon members are combined and any other
+    geometry (points, lines) is skipped. GeoJSON positions are
+    [longitude, latitude] and are converted to the (lat, lon) order used
+    throughout the library.
+    """
+    with open(path, "r", encoding="utf-8") as file:
+        document = json.load(file)
+
+    parts = []
+    for geometry in _iter_geometries(document):
+        geometry_type = geometry.get("type")
+        if geometry_type == "Polygon":
+            polygons = [geometry["coordinates"]]
+        elif geometry_type == "MultiPolygon":
+            polygons = geometry["coordinates"]
+        else:
+            continue
+
+        for rings in polygons:
+            parts.append(
+                [[(float(pos[1]), float(pos[0])) for pos in ring] for ring in rings]
+            )
+
+    if not parts:
+        raise ValueError(f"No polygon geometry found in '{path}'")
+    return PreparedPolygon(parts)
+
+
+def _iter_geometries(document: dict[str, Any]) -> Iterator[dict[str, Any]]:
+    document_type = document.get("type")
+    if document_type == "FeatureCollection":
+        for feature in document.get("features", []):
+            yield from _iter_geometries(feature)
+    elif document_type == "Feature":
+        if document.get("geometry"):
+            yield from _iter_geometries(document["geometry"])
+    elif document_type == "GeometryCollection":
+        for geometry in document.get("geometries", []):
+            yield from _iter_geometries(geometry)
+    else:
+        yield document
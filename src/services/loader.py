@@ -1,4 +1,6 @@
 import csv
+import errno
+import glob
 
 from ..models.image_metadata import ImageMetadata
 
@@ -17,3 +19,27 @@ class ImageLibraryLoader:
                 if cleaned_row:  # Only add non-empty rows
                     self.images.append(ImageMetadata(**cleaned_row))
         return self.images
+
+
+def expand_csv_paths(patterns: list[str]) -> list[str]:
+    """
+    Expand CSV paths and glob patterns into an ordered list of shard paths.
+
+    Glob matches are sorted so shard order (and therefore result order) is
+    stable between runs. Duplicate paths are only loaded once.
+    """
+    paths: list[str] = []
+    for pattern in patterns:
+        if any(char in pattern for char in "*?["):
+            matches = sorted(glob.glob(pattern))
+            if not matches:
+                raise FileNotFoundError(
+                    errno.ENOENT, "No CSV files match pattern", pattern
+                )
+        else:
+            matches = [pattern]
+
+        for path in matches:
+            if path not in paths:
+                paths.append(path)
+    return paths
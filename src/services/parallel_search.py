@@ -0,0 +1,362 @@
+import math
+import operator
+import weakref
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import resource_tracker, shared_memory
+from typing import Any, Callable, Optional
+
+from ..models.image_metadata import ImageMetadata
+from ..models.search_criteria import SearchCriteria
+from .geospatial import PreparedPolygon
+
+COMPARISONS: dict[str, Callable[[float, float], bool]] = {
+    ">=": operator.ge,
+    "<=": operator.le,
+    ">": operator.gt,
+    "<": operator.lt,
+}
+
+# Shared memory array: (block name, array typecode, length)
+Segment = tuple[str, str, int]
+
+
+def _cast_view(
+    block: shared_memory.SharedMemory, typecode: str, length: int
+) -> memoryview:
+    return block.buf[: length * array(typecode).itemsize].cast(typecode)
+
+
+def _release_blocks(blocks: list[shared_memory.SharedMemory]) -> None:
+    for block in blocks:
+        block.close()
+        block.unlink()
+
+
+def column_keys(criteria: SearchCriteria, polygons: list[PreparedPolygon]) -> list[str]:
+    """Keys of the ColumnStore columns a search reads."""
+    keys = []
+    for field, op, value in criteria.tag_criteria:
+        if op == "=":
+            keys.append(f"eq:{field}")
+        elif op in COMPARISONS:
+            try:
+                float(value)
+            except (ValueError, TypeError):
+                # The plan can never match, so the column is not needed
+                continue
+            keys.append(f"num:{field}")
+    if criteria.user_tags:
+        keys.append("tags")
+    if polygons:
+        keys.append("coords")
+    return list(dict.fromkeys(keys))
+
+
+def encode_chunk(
+    images: list[ImageMetadata], key: str
+) -> tuple[dict[str, array], Optional[list[str]]]:
+    """
+    Encode one column for a chunk of rows.
+
+    Returns the column's arrays and, for coded columns, the chunk's own
+    vocabulary (the code of a value is its index in the list).
+    """
+    kind, _, field = key.partition(":")
+
+    if kind == "eq":
+        vocab: dict[str, int] = {}
+        codes = array("i")
+        for image in images:
+            value = image.get(field)
+            if value is None:
+                codes.append(-1)
+            else:
+                codes.append(vocab.setdefault(str(value).lower(), len(vocab)))
+        return {"codes": codes}, list(vocab)
+
+    if kind == "num":
+        values = array("d")
+        for image in images:
+            try:
+                values.append(float(image.get(field)))
+            except (ValueError, TypeError):
+                values.append(math.nan)
+        return {"values": values}, None
+
+    if kind == "tags":
+        vocab = {}
+        offsets = array("i", [0])
+        tags = array("i")
+        for image in images:
+            for tag in image.tags:
+                tags.append(vocab.setdefault(tag.lower(), len(vocab)))
+            offsets.append(len(tags))
+        return {"offsets": offsets, "tags": tags}, list(vocab)
+
+    lats = array("d")
+    lons = array("d")
+    for image in images:
+        coords = image.get_coordinates()
+        lats.append(coords[0] if coords else math.nan)
+        lons.append(coords[1] if coords else math.nan)
+    return {"lat": lats, "lon": lons}, None
+
+
+# State of the current scan worker process, kept for the life of the pool
+_worker_images: list[ImageMetadata] = []
+_worker_blocks: dict[str, shared_memory.SharedMemory] = {}
+
+
+def _init_scan_worker(images: list[ImageMetadata]) -> None:
+    # Under the fork start method the library is inherited, not pickled
+    global _worker_images
+    _worker_images = images
+
+
+def _build_in_worker(
+    key: str, start: int, end: int
+) -> tuple[dict[str, Segment], Optional[list[str]]]:
+    arrays, vocab = encode_chunk(_worker_images[start:end], key)
+    segments = {}
+    for name, values in arrays.items():
+        data = values.tobytes()
+        # Zero-sized blocks are not allowed
+        block = shared_memory.SharedMemory(create=True, size=max(len(data), 1))
+        block.buf[: len(data)] = data
+        _worker_blocks[block.name] = block
+        segments[name] = (block.name, values.typecode, len(values))
+    return segments, vocab
+
+
+def create_scan_pool(images: list[ImageMetadata], workers: int) -> ProcessPoolExecutor:
+    """Start long-lived worker processes that hold the library."""
+    # Workers must share the parent's tracker; one started inside a worker
+    # would unlink the blocks it created when the pool shuts down
+    resource_tracker.ensure_running()
+    return ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_scan_worker, initargs=(images,)
+    )
+
+
+class ColumnStore:
+    """
+    Columnar copy of a library in shared memory for parallel scans.
+
+    The rows are split into fixed chunks and every column is stored as one
+    shared memory segment per chunk. Columns are built on demand for the
+    fields a search touches, with the pool workers encoding the chunks in
+    parallel, and kept for later searches. Scans read the segments in place,
+    so records are never pickled. Column keys:
+
+    - eq:<field>: int32 codes of the lower-cased value (-1 when missing),
+      with a code dictionary per chunk kept in the parent
+    - num:<field>: float64 values, NaN when missing or not numeric
+    - tags: int32 user tag codes per row, CSR style, coded like eq columns
+    - coords: float64 lat / lon, NaN when missing
+    """
+
+    def __init__(self, row_count: int, chunk_count: int) -> None:
+        size = max(1, -(-row_count // chunk_count))
+        self.chunks = [
+            (start, min(start + size, row_count)) for start in range(0, row_count, size)
+        ]
+        self.segments: dict[str, list[dict[str, Segment]]] = {}
+        self.codes: dict[str, list[dict[str, int]]] = {}
+        self._blocks: list[shared_memory.SharedMemory] = []
+        self._finalizer = weakref.finalize(self, _release_blocks, self._blocks)
+
+    def close(self) -> None:
+        self._finalizer()
+
+    def ensure(self, keys: list[str], executor: ProcessPoolExecutor) -> None:
+        """Build the missing columns, one worker task per column chunk."""
+        missing = [key for key in keys if key not in self.segments]
+        futures = [
+            (
+                key,
+                [
+                    executor.submit(_build_in_worker, key, *chunk)
+                    for chunk in self.chunks
+                ],
+            )
+            for key in missing
+        ]
+        for key, chunk_futures in futures:
+            segments = []
+            codes = []
+            for future in chunk_futures:
+                chunk_segments, vocab = future.result()
+                # Attach from the parent so close() can unlink every block
+                for block_name, _, _ in chunk_segments.values():
+                    self._blocks.append(shared_memory.SharedMemory(name=block_name))
+                segments.append(chunk_segments)
+                codes.append({value: code for code, value in enumerate(vocab or [])})
+            self.segments[key] = segments
+            self.codes[key] = codes
+
+
+class CriteriaPlan:
+    """
+    SearchCriteria compiled against a ColumnStore.
+
+    Values are resolved to per-chunk column codes and floats up front so
+    workers only compare numbers. A chunk where a required value or tag
+    never occurs is skipped, and a plan that can never match (unknown value,
+    bad number or operator) is flagged instead.
+    """
+
+    def __init__(
+        self,
+        criteria: SearchCriteria,
+        store: ColumnStore,
+        polygons: list[PreparedPolygon],
+    ) -> None:
+        self.never_matches = False
+        self.equals: list[tuple[str, list[Optional[int]]]] = []
+        self.comparisons: list[tuple[str, str, float]] = []
+        self.tags: list[list[Optional[int]]] = []
+        self.polygons = polygons
+
+        for field, op, value in criteria.tag_criteria:
+            if op == "=":
+                key = f"eq:{field}"
+                target = str(value).lower()
+                self.equals.append(
+                    (key, [codes.get(target) for codes in store.codes[key]])
+                )
+            elif op in COMPARISONS:
+                try:
+                    number = float(value)
+                except (ValueError, TypeError):
+                    self.never_matches = True
+                    continue
+                self.comparisons.append((f"num:{field}", op, number))
+            else:
+                self.never_matches = True
+
+        for tag in criteria.user_tags:
+            self.tags.append([codes.get(tag.lower()) for codes in store.codes["tags"]])
+
+        if all(self.skips_chunk(index) for index in range(len(store.chunks))):
+            self.never_matches = True
+
+    def skips_chunk(self, index: int) -> bool:
+        """Whether a required value or tag never occurs in the chunk."""
+        return any(codes[index] is None for _, codes in self.equals) or any(
+            codes[index] is None for codes in self.tags
+        )
+
+
+def scan_rows(
+    plan: CriteriaPlan,
+    index: int,
+    start: int,
+    end: int,
+    column: Callable[[str, str], Any],
+) -> list[int]:
+    """Return the ids of rows in chunk `index` ([start, end)) matching the plan."""
+    if plan.never_matches or plan.skips_chunk(index):
+        return []
+
+    # Segments are indexed from the start of their chunk
+    rows: Any = range(end - start)
+
+    for key, codes in plan.equals:
+        values = column(key, "codes")
+        code = codes[index]
+        rows = [row for row in rows if values[row] == code]
+
+    for key, op, number in plan.comparisons:
+        values = column(key, "values")
+        compare = COMPARISONS[op]
+        # NaN (missing or not numeric) fails every comparison
+        rows = [row for row in rows if compare(values[row], number)]
+
+    if plan.tags:
+        offsets = column("tags", "offsets")
+        tags = column("tags", "tags")
+        for codes in plan.tags:
+            code = codes[index]
+            rows = [
+                row for row in rows if code in tags[offsets[row] : offsets[row + 1]]
+            ]
+
+    if plan.polygons:
+        lats = column("coords", "lat")
+        lons = column("coords", "lon")
+        rows = [
+            row
+            for row in rows
+            if not math.isnan(lats[row])
+            and all(p.contains((lats[row], lons[row])) for p in plan.polygons)
+        ]
+
+    return [start + row for row in rows]
+
+
+# A chunk to scan: (index, start, end, {column key: {array name: segment}})
+ChunkTask = tuple[int, int, int, dict[str, dict[str, Segment]]]
+
+
+def _scan_in_worker(
+    plan: CriteriaPlan, chunks: list[ChunkTask]
+) -> list[tuple[int, list[int]]]:
+    views: list[memoryview] = []
+    results = []
+
+    try:
+        for index, start, end, segments in chunks:
+
+            def column(key: str, name: str) -> memoryview:
+                block_name, typecode, length = segments[key][name]
+                # Attach lazily; blocks built by other workers are new here
+                if block_name not in _worker_blocks:
+                    _worker_blocks[block_name] = shared_memory.SharedMemory(
+                        name=block_name
+                    )
+                view = _cast_view(_worker_blocks[block_name], typecode, length)
+                views.append(view)
+                return view
+
+            results.append((index, scan_rows(plan, index, start, end, column)))
+        return results
+    finally:
+        # Views must be released before the blocks can be closed
+        for view in reversed(views):
+            view.release()
+
+
+def parallel_search(
+    executor: ProcessPoolExecutor,
+    store: ColumnStore,
+    criteria: SearchCriteria,
+    polygons: list[PreparedPolygon],
+    workers: int,
+) -> list[int]:
+    """
+    Scan the whole store with a long-lived process pool, returning row ids.
+
+    Missing columns are first encoded by the workers. The chunks that can
+    hold matches are then dealt out round-robin into one task per worker, so
+    each task covers a spread of the library and uneven regions (for example,
+    dense polygon hits) still balance. Results are merged in row order.
+    """
+    keys = column_keys(criteria, polygons)
+    store.ensure(keys, executor)
+    plan = CriteriaPlan(criteria, store, polygons)
+    if plan.never_matches:
+        return []
+
+    chunks = [
+        (index, start, end, {key: store.segments[key][index] for key in keys})
+        for index, (start, end) in enumerate(store.chunks)
+        if not plan.skips_chunk(index)
+    ]
+    futures = [
+        executor.submit(_scan_in_worker, plan, chunks[i::workers])
+        for i in range(min(workers, len(chunks)))
+    ]
+
+    matches = sorted(part for future in futures for part in future.result())
+    return [row for _, rows in matches for row in rows]
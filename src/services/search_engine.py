@@ -1,22 +1,126 @@
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
 from ..models.image_metadata import ImageMetadata
 from ..models.search_criteria import SearchCriteria
-from .geospatial import point_in_polygon
+from .geospatial import PreparedPolygon, load_geojson_polygon
+from .parallel_search import ColumnStore, create_scan_pool, parallel_search
+from .spatial_index import SpatialIndex
+
+DEFAULT_PARALLEL_THRESHOLD = 50000
 
 
 class SearchEngine:
-    def __init__(self, images: list[ImageMetadata]) -> None:
+
+    def __init__(
+        self,
+        images: list[ImageMetadata],
+        workers: int = 1,
+        parallel_threshold: int = DEFAULT_PARALLEL_THRESHOLD,
+    ) -> None:
         self.images = images
+        # Libraries with at least parallel_threshold images are scanned by
+        # `workers` processes; smaller ones stay serial
+        self.workers = workers
+        self.parallel_threshold = parallel_threshold
+        self._spatial_index: Optional[SpatialIndex] = None
+        self._column_store: Optional[ColumnStore] = None
+        self._scan_pool: Optional[ProcessPoolExecutor] = None
+
+    def close(self) -> None:
+        # Stop the scan workers and release their shared memory columns
+        if self._scan_pool is not None:
+            self._scan_pool.shutdown()
+            self._scan_pool = None
+        if self._column_store is not None:
+            self._column_store.close()
+            self._column_store = None
 
-    def search(self, criteria: SearchCriteria) -> list[ImageMetadata]:
+    def search(
+        self,
+        criteria: SearchCriteria,
+        polygons: Optional[list[PreparedPolygon]] = None,
+    ) -> list[ImageMetadata]:
         results = []
+        if polygons is None:
+            polygons = self.prepare_polygons(criteria)
+
+        if criteria.near:
+            return self._search_near(criteria, polygons)
+
+        if self.workers > 1 and len(self.images) >= self.parallel_threshold:
+            # The column store and worker pool are kept for later searches
+            if self._scan_pool is None:
+                self._scan_pool = create_scan_pool(self.images, self.workers)
+            if self._column_store is None:
+                # A few chunks per worker keeps uneven regions balanced
+                self._column_store = ColumnStore(len(self.images), self.workers * 4)
+            rows = parallel_search(
+                self._scan_pool, self._column_store, criteria, polygons, self.workers
+            )
+            return [self.images[row] for row in rows]
 
         for image in self.images:
-            if self._matches_criteria(image, criteria):
+            if self._matches_criteria(image, criteria, polygons):
                 results.append(image)
 
         return results
 
-    def _matches_criteria(self, image: ImageMetadata, criteria: SearchCriteria) -> bool:
+    def _get_spatial_index(self) -> SpatialIndex:
+        # Built on first use and reused by every later distance query
+        if self._spatial_index is None:
+            self._spatial_index = SpatialIndex(
+                [image.get_coordinates() for image in self.images]
+            )
+        return self._spatial_index
+
+    def _search_near(
+        self, criteria: SearchCriteria, polygons: list[PreparedPolygon]
+    ) -> list[ImageMetadata]:
+        # Results are ordered by distance from the search centre
+        index = self._get_spatial_index()
+        lat, lon = criteria.near
+
+        if criteria.nearest is None:
+            if criteria.radius_km is None:
+                raise ValueError("A radius or nearest count is required with near")
+            candidates = index.within_radius(lat, lon, criteria.radius_km)
+            return [
+                self.images[image_id]
+                for _, image_id in candidates
+                if self._matches_criteria(self.images[image_id], criteria, polygons)
+            ]
+
+        # Other criteria may reject some of the closest images, so widen the
+        # neighbourhood until enough matches are found or the index runs out
+        fetch = criteria.nearest
+        while True:
+            candidates = index.nearest(lat, lon, fetch, criteria.radius_km)
+            results = [
+                self.images[image_id]
+                for _, image_id in candidates
+                if self._matches_criteria(self.images[image_id], criteria, polygons)
+            ]
+            if len(results) >= criteria.nearest or len(candidates) < fetch:
+                return results[: criteria.nearest]
+            fetch *= 2
+
+    @staticmethod
+    def prepare_polygons(criteria: SearchCriteria) -> list[PreparedPolygon]:
+        # Compile polygon constraints once per search rather than per image
+        polygons = []
+        if criteria.polygon:
+            polygons.append(PreparedPolygon.from_coordinates(criteria.polygon))
+        if criteria.polygon_file:
+            polygons.append(load_geojson_polygon(criteria.polygon_file))
+        return polygons
+
+    def _matches_criteria(
+        self,
+        image: ImageMetadata,
+        criteria: SearchCriteria,
+        polygons: list[PreparedPolygon],
+    ) -> bool:
         # Check tag-value criteria (AND operation)
         for field, operator, value in criteria.tag_criteria:
             if not image.matches_tag_value(field, operator, value):
@@ -27,10 +131,13 @@ class SearchEngine:
             if not image.has_tag(tag):
                 return False
 
-        # Check polygon constraint
-        if criteria.polygon:
+        # Check polygon constraints (AND operation)
+        if polygons:
             coords = image.get_coordinates()
-            if not coords or not point_in_polygon(coords, criteria.polygon):
+            if not coords:
                 return False
+            for polygon in polygons:
+                if not polygon.contains(coords):
+                    return False
 
         return True
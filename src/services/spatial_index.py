@@ -0,0 +1,179 @@
+import heapq
+import math
+from typing import Optional
+
+from .geospatial import EARTH_RADIUS_KM, haversine_km
+
+LEAF_SIZE = 16
+
+
+def _to_unit_vector(lat: float, lon: float) -> tuple[float, float, float]:
+    lat_rad = math.radians(lat)
+    lon_rad = math.radians(lon)
+    cos_lat = math.cos(lat_rad)
+    return (cos_lat * math.cos(lon_rad), cos_lat * math.sin(lon_rad), math.sin(lat_rad))
+
+
+def _chord_squared(radius_km: float) -> float:
+    # Squared straight-line distance between two unit vectors that are
+    # radius_km apart along the surface of the earth
+    angle = radius_km / EARTH_RADIUS_KM
+    if angle >= math.pi:
+        return 4.0
+    return (2.0 * math.sin(angle / 2.0)) ** 2
+
+
+class SpatialIndex:
+    """
+    KD-tree over image coordinates for radius and nearest-neighbour queries.
+
+    Coordinates are mapped onto 3D unit vectors, where straight-line (chord)
+    distance grows monotonically with great-circle distance. Tree pruning
+    therefore works across the antimeridian and near the poles without any
+    special cases. Reported distances are haversine kilometres and results
+    are ordered nearest first.
+
+    Items are identified by their position in the list passed to the
+    constructor; entries without coordinates are skipped.
+    """
+
+    def __init__(self, coordinates: list[Optional[tuple[float, float]]]) -> None:
+        self._ids: list[int] = []
+        self._latlon: list[tuple[float, float]] = []
+        self._points: list[tuple[float, float, float]] = []
+        for item_id, coords in enumerate(coordinates):
+            if coords is None:
+                continue
+            self._ids.append(item_id)
+            self._latlon.append(coords)
+            self._points.append(_to_unit_vector(*coords))
+
+        # Node layout: [lo, hi, left, right, min_corner, max_corner]
+        # Leaves have left == right == -1 and own self._order[lo:hi]
+        self._order: list[int] = list(range(len(self._points)))
+        self._nodes: list[list] = []
+        if self._points:
+            self._build(0, len(self._order))
+
+    def __len__(self) -> int:
+        return len(self._points)
+
+    def _build(self, lo: int, hi: int) -> int:
+        points = self._points
+        members = self._order[lo:hi]
+        min_corner = tuple(min(points[i][axis] for i in members) for axis in range(3))
+        max_corner = tuple(max(points[i][axis] for i in members) for axis in range(3))
+
+        node_id = len(self._nodes)
+        node = [lo, hi, -1, -1, min_corner, max_corner]
+        self._nodes.append(node)
+
+        if hi - lo > LEAF_SIZE:
+            # Split on the widest axis at the median
+            axis = max(range(3), key=lambda a: max_corner[a] - min_corner[a])
+            members.sort(key=lambda i: points[i][axis])
+            self._order[lo:hi] = members
+            mid = (lo + hi) // 2
+            node[2] = self._build(lo, mid)
+            node[3] = self._build(mid, hi)
+
+        return node_id
+
+    def _box_distance_squared(
+        self, node: list, point: tuple[float, float, float]
+    ) -> float:
+        total = 0.0
+        for axis in range(3):
+            value = point[axis]
+            if value < node[4][axis]:
+                delta = node[4][axis] - value
+            elif value > node[5][axis]:
+                delta = value - node[5][axis]
+            else:
+                continue
+            total += delta * delta
+        return total
+
+    def _point_distance_squared(
+        self, index: int, point: tuple[float, float, float]
+    ) -> float:
+        px, py, pz = self._points[index]
+        return (px - point[0]) ** 2 + (py - point[1]) ** 2 + (pz - point[2]) ** 2
+
+    def within_radius(
+        self, lat: float, lon: float, radius_km: float
+    ) -> list[tuple[float, int]]:
+        """Return (distance_km, item_id) pairs within radius_km, nearest first."""
+        if not self._nodes or radius_km < 0:
+            return []
+
+        query = _to_unit_vector(lat, lon)
+        # Small tolerance so points exactly on the radius survive rounding;
+        # the haversine check below makes the final decision
+        limit = _chord_squared(radius_km) * (1 + 1e-9) + 1e-15
+
+        matches = []
+        stack = [0]
+        while stack:
+            node = self._nodes[stack.pop()]
+            if self._box_distance_squared(node, query) > limit:
+                continue
+            if node[2] == -1:
+                for index in self._order[node[0] : node[1]]:
+                    if self._point_distance_squared(index, query) <= limit:
+                        distance = haversine_km((lat, lon), self._latlon[index])
+                        if distance <= radius_km:
+                            matches.append((distance, self._ids[index]))
+            else:
+                stack.append(node[2])
+                stack.append(node[3])
+
+        matches.sort()
+        return matches
+
+    def nearest(
+        self, lat: float, lon: float, k: int, max_km: Optional[float] = None
+    ) -> list[tuple[float, int]]:
+        """Return up to k (distance_km, item_id) pairs, nearest first."""
+        if not self._nodes or k <= 0:
+            return []
+
+        query = _to_unit_vector(lat, lon)
+        limit = math.inf if max_km is None else _chord_squared(max_km) * (1 + 1e-9)
+
+        # Max-heap of the best k candidates as (-distance_squared, index)
+        best: list[tuple[float, int]] = []
+        stack = [0]
+        while stack:
+            node = self._nodes[stack.pop()]
+            worst = -best[0][0] if len(best) == k else limit
+            if self._box_distance_squared(node, query) > worst:
+                continue
+            if node[2] == -1:
+                for index in self._order[node[0] : node[1]]:
+                    dist2 = self._point_distance_squared(index, query)
+                    if len(best) < k:
+                        if dist2 <= limit:
+                            heapq.heappush(best, (-dist2, index))
+                    elif dist2 < -best[0][0]:
+                        heapq.heapreplace(best, (-dist2, index))
+            else:
+                # Visit the nearer child first so the bound tightens quickly
+                left = self._nodes[node[2]]
+                right = self._nodes[node[3]]
+                if self._box_distance_squared(
+                    left, query
+                ) <= self._box_distance_squared(right, query):
+                    stack.append(node[3])
+                    stack.append(node[2])
+                else:
+                    stack.append(node[2])
+                    stack.append(node[3])
+
+        results = []
+        for _, index in best:
+            distance = haversine_km((lat, lon), self._latlon[index])
+            if max_km is None or distance <= max_km:
+                results.append((distance, self._ids[index]))
+        results.sort()
+        return results
@@ -0,0 +1,180 @@
+import os
+import sys
+import pytest  # type: ignore
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from src.cli.interface import CommandLineInterface
+from src.models.search_criteria import SearchCriteria
+from src.services.federated_search import FederatedSearchEngine
+from src.services.loader import expand_csv_paths
+
+HEADER = "Filename,Favorite,(Center) Coordinate\n"
+
+
+def write_shard(directory, name, rows):
+    path = directory / name
+    path.write_text(HEADER + "".join(row + "\n" for row in rows), encoding="utf-8")
+    return str(path)
+
+
+@pytest.fixture
+def shards(tmp_path):
+    return [
+        write_shard(
+            tmp_path, "2021.csv", ['a1.jpg,Yes,"51.05, -114.08"', "a2.jpg,No,"]
+        ),
+        write_shard(
+            tmp_path, "2022.csv", ['b1.jpg,Yes,"51.29, -114.01"', "b2.jpg,Yes,"]
+        ),
+        write_shard(
+            tmp_path,
+            "2023.csv",
+            ['c1.jpg,No,"53.55, -113.47"', 'c2.jpg,Yes,"51.10, -114.05"'],
+        ),
+    ]
+
+
+class TestExpandCsvPaths:
+    """Test cases for resolving CSV shard paths and globs."""
+
+    def test_glob_is_sorted(self, tmp_path, shards):
+        """Test glob matches come back in sorted order."""
+        assert expand_csv_paths([str(tmp_path / "*.csv")]) == shards
+
+    def test_duplicates_removed(self, tmp_path, shards):
+        """Test paths named twice are only loaded once."""
+        paths = expand_csv_paths([shards[1], str(tmp_path / "*.csv")])
+        assert paths == [shards[1], shards[0], shards[2]]
+
+    def test_unmatched_glob(self, tmp_path):
+        """Test a glob without matches raises FileNotFoundError."""
+        with pytest.raises(FileNotFoundError):
+            expand_csv_paths([str(tmp_path / "missing_*.csv")])
+
+
+class TestFederatedSearchEngine:
+    """Test cases for searching across CSV shards."""
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_results_merged_in_shard_order(self, shards, workers):
+        """Test results keep shard then row order, serially and in a process pool."""
+        criteria = SearchCriteria()
+        criteria.add_tag_criterion("Favorite", "=", "Yes")
+
+        with FederatedSearchEngine(shards, max_workers=workers) as engine:
+            results = engine.search(criteria)
+
+        assert [image.get("Filename") for image in results] == [
+            "a1.jpg",
+            "b1.jpg",
+            "b2.jpg",
+            "c2.jpg",
+        ]
+        assert engine.records_loaded == 6
+        assert [shard.records_loaded for shard in engine.shard_results] == [2, 2, 2]
+        assert [shard.records_found for shard in engine.shard_results] == [1, 2, 1]
+        assert all(shard.load_seconds >= 0 for shard in engine.shard_results)
+
+    def test_nearest_merged_by_distance(self, shards):
+        """Test nearest queries pick the closest images across all shards."""
+        criteria = SearchCriteria()
+        criteria.set_near(51.05, -114.08, nearest=2)
+
+        with FederatedSearchEngine(shards, max_workers=2) as engine:
+            results = engine.search(criteria)
+
+        assert [image.get("Filename") for image in results] == ["a1.jpg", "c2.jpg"]
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_shards_loaded_once(self, shards, workers):
+        """Test later searches reuse loaded shards instead of re-reading CSVs."""
+        with FederatedSearchEngine(shards, max_workers=workers) as engine:
+            engine.load()
+            first = engine.search(SearchCriteria())
+            load_seconds = [shard.load_seconds for shard in engine.shard_results]
+
+            # Changing the files on disk must not affect the loaded library
+            for path in shards:
+                with open(path, "a", encoding="utf-8") as file:
+                    file.write("extra.jpg,Yes,\n")
+
+            criteria = SearchCriteria()
+            criteria.set_near(51.05, -114.08, radius_km=50.0)
+            nearby = engine.search(criteria)
+            second = engine.search(SearchCriteria())
+
+            assert len(first) == len(second) == 6
+            assert engine.records_loaded == 6
+            assert [s.load_seconds for s in engine.shard_results] == load_seconds
+            assert [image.get("Filename") for image in nearby] == [
+                "a1.jpg",
+                "c2.jpg",
+                "b1.jpg",
+            ]
+
+    def test_polygon_search_in_workers(self, shards):
+        """Test polygons are compiled in the workers and applied to every shard."""
+        criteria = SearchCriteria()
+        criteria.set_polygon(
+            [(51.0, -114.2), (51.0, -113.9), (51.4, -113.9), (51.4, -114.2)]
+        )
+
+        with FederatedSearchEngine(shards, max_workers=2) as engine:
+            results = engine.search(criteria)
+
+        assert [image.get("Filename") for image in results] == [
+            "a1.jpg",
+            "b1.jpg",
+            "c2.jpg",
+        ]
+
+    def test_missing_shard(self, tmp_path, shards):
+        """Test a missing shard surfaces FileNotFoundError from the workers."""
+        engine = FederatedSearchEngine(
+            shards + [str(tmp_path / "gone.csv")], max_workers=2
+        )
+
+        with pytest.raises(FileNotFoundError):
+            engine.load()
+
+    def test_bad_polygon_file_fails_before_loading(self, tmp_path, shards):
+        """Test a missing polygon file is reported before any shard is loaded."""
+        criteria = SearchCriteria()
+        criteria.set_polygon_file(str(tmp_path / "missing.geojson"))
+
+        with FederatedSearchEngine(shards, max_workers=2) as engine:
+            with pytest.raises(FileNotFoundError):
+                engine.search(criteria)
+            assert engine.records_loaded == 0
+            assert engine._executors == []
+
+
+class TestExecutionArguments:
+    """Test cases for validating --workers and --parallel-threshold."""
+
+    def criteria_for(self, *argv):
+        cli = CommandLineInterface()
+        return cli.create_search_criteria(cli.parser.parse_args(list(argv)))
+
+    def test_valid_arguments(self):
+        """Test the smallest accepted values."""
+        self.criteria_for("--workers", "1", "--parallel-threshold", "0")
+
+    @pytest.mark.parametrize(
+        "argv",
+        [
+            ["--workers", "0"],
+            ["--workers", "-3"],
+            ["--parallel-threshold", "-1"],
+        ],
+    )
+    def test_invalid_arguments(self, argv):
+        """Test zero or negative worker counts and negative thresholds raise."""
+        with pytest.raises(ValueError):
+            self.criteria_for(*argv)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -1,12 +1,18 @@
+import json
+import math
 import os
+import random
 import sys
 import pytest  # type: ignore
 
 # Add src to path for imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
 
-from src.services.geospatial import point_in_polygon
-
+from src.services.geospatial import (
+    PreparedPolygon,
+    load_geojson_polygon,
+    point_in_polygon,
+)
 
 class TestPointInPolygon:
     """Test cases for the point_in_polygon ray casting algorithm."""
@@ -169,5 +175,226 @@ class TestPointInPolygon:
         assert point_in_polygon(outside_point, counterclockwise) == False
 
 
+class TestPreparedPolygon:
+    """Test cases for the preprocessed PreparedPolygon structure."""
+
+    def test_matches_ray_casting_on_simple_polygons(self):
+        """Test that results match point_in_polygon, including edges and vertices."""
+        polygons = [
+            [(0.0, 0.0), (4.0, 0.0), (4.0, 3.0), (0.0, 3.0)],
+            [(0.0, 0.0), (4.0, 0.0), (2.0, 3.0)],
+            [(0.0, 2.0), (2.0, 1.0), (1.0, -1.0), (-1.0, -1.0), (-2.0, 1.0)],
+        ]
+        # Grid of points on and around every vertex and edge
+        points = [(x / 2.0, y / 2.0) for x in range(-6, 11) for y in range(-6, 9)]
+
+        for polygon in polygons:
+            prepared = PreparedPolygon.from_coordinates(polygon)
+            for point in points:
+                assert prepared.contains(point) == point_in_polygon(point, polygon)
+
+    def test_matches_ray_casting_on_large_polygon(self):
+        """Test a large jagged polygon with merged slabs against random points."""
+        rng = random.Random(42)
+        n = 5000
+        polygon = []
+        for i in range(n):
+            angle = 2 * math.pi * i / n
+            radius = 10.0 + rng.uniform(-3.0, 3.0)
+            polygon.append((radius * math.cos(angle), radius * math.sin(angle)))
+
+        prepared = PreparedPolygon([[polygon]], max_duplication=2)
+        for _ in range(300):
+            point = (rng.uniform(-14.0, 14.0), rng.uniform(-14.0, 14.0))
+            assert prepared.contains(point) == point_in_polygon(point, polygon)
+
+    def make_wobbly_circle(self, n, seed=1):
+        # Noise shrinks with the edge length, like a detailed border
+        rng = random.Random(seed)
+        polygon = []
+        for i in range(n):
+            angle = 2 * math.pi * i / n
+            radius = 10.0 + rng.uniform(-1.0, 1.0) * 20.0 / n
+            polygon.append((radius * math.cos(angle), radius * math.sin(angle)))
+        return polygon
+
+    def mean_edges_tested(self, prepared, points):
+        total = 0
+        for point in points:
+            slab_edges, start = prepared._candidates(point)
+            total += len(slab_edges) - start
+        return total / len(points)
+
+    def test_edges_tested_per_point_does_not_grow_with_size(self):
+        """Test per-point work stays flat when the vertex count grows 32x."""
+        rng = random.Random(5)
+        points = [(rng.uniform(-9.0, 9.0), rng.uniform(-9.0, 9.0)) for _ in range(500)]
+
+        small = PreparedPolygon.from_coordinates(self.make_wobbly_circle(1000))
+        large = PreparedPolygon.from_coordinates(self.make_wobbly_circle(32000))
+
+        assert self.mean_edges_tested(small, points) <= 4
+        assert self.mean_edges_tested(large, points) <= 4
+        for point in points[:50]:
+            assert large.contains(point) == small.contains(point)
+
+    def test_duplication_budget(self):
+        """Test long edges spanning many slabs stay within the duplication budget."""
+        rng = random.Random(9)
+        n = 4000
+        # Jagged ring: every edge spans the y-coordinates of many other vertices
+        polygon = []
+        for i in range(n):
+            angle = 2 * math.pi * i / n
+            radius = 10.0 + rng.uniform(-3.0, 3.0)
+            polygon.append((radius * math.cos(angle), radius * math.sin(angle)))
+
+        prepared = PreparedPolygon.from_coordinates(polygon, max_duplication=8)
+
+        assert sum(len(slab) for slab in prepared._slabs) <= 8 * prepared.edge_count
+        for _ in range(200):
+            point = (rng.uniform(-14.0, 14.0), rng.uniform(-14.0, 14.0))
+            assert prepared.contains(point) == point_in_polygon(point, polygon)
+
+    def test_bounding_box_rejection(self):
+        """Test points outside the bounding box are rejected."""
+        prepared = PreparedPolygon.from_coordinates(
+            [(0.0, 0.0), (4.0, 0.0), (4.0, 3.0), (0.0, 3.0)]
+        )
+
+        assert prepared.bounds == (0.0, 0.0, 4.0, 3.0)
+        assert prepared.contains((5.0, 1.0)) == False
+        assert prepared.contains((2.0, -1.0)) == False
+        assert prepared.contains((2.0, 4.0)) == False
+
+    def test_polygon_with_hole(self):
+        """Test that points inside a hole are outside the polygon."""
+        outer = [(0.0, 0.0), (10.0, 0.0), (10.0, 10.0), (0.0, 10.0)]
+        hole = [(4.0, 4.0), (6.0, 4.0), (6.0, 6.0), (4.0, 6.0)]
+        prepared = PreparedPolygon([[outer, hole]])
+
+        assert prepared.contains((2.0, 2.0)) == True
+        assert prepared.contains((5.0, 5.0)) == False
+        assert prepared.contains((8.0, 5.0)) == True
+        assert prepared.contains((11.0, 5.0)) == False
+
+    def test_multipolygon(self):
+        """Test that a point inside any part is inside the multipolygon."""
+        left = [(0.0, 0.0), (2.0, 0.0), (2.0, 2.0), (0.0, 2.0)]
+        right = [(5.0, 0.0), (7.0, 0.0), (7.0, 2.0), (5.0, 2.0)]
+        prepared = PreparedPolygon([[left], [right]])
+
+        assert prepared.contains((1.0, 1.0)) == True
+        assert prepared.contains((6.0, 1.0)) == True
+        # Between the parts the ray crosses both, but each part is counted separately
+        assert prepared.contains((3.5, 1.0)) == False
+
+    def test_empty_polygon(self):
+        """Test that degenerate geometry contains nothing."""
+        prepared = PreparedPolygon([[[(0.0, 0.0), (1.0, 0.0)]]])
+
+        assert prepared.bounds is None
+        assert prepared.contains((0.5, 0.0)) == False
+
+    def test_load_geojson_feature_collection(self, tmp_path):
+        """Test loading GeoJSON with [lon, lat] positions, holes and multiple parts."""
+        document = {
+            "type": "FeatureCollection",
+            "features": [
+                {
+                    "type": "Feature",
+                    "properties": {"name": "Calgary area"},
+                    "geometry": {
+                        "type": "Polygon",
+                        "coordinates": [
+                            [
+                                [-115.0, 50.0],
+                                [-113.0, 50.0],
+                                [-113.0, 52.0],
+                                [-115.0, 52.0],
+                                [-115.0, 50.0],
+                            ],
+                            [
+                                [-114.2, 51.0],
+                                [-114.0, 51.0],
+                                [-114.0, 51.1],
+                                [-114.2, 51.1],
+                                [-114.2, 51.0],
+                            ],
+                        ],
+                    },
+                },
+                {
+                    "type": "Feature",
+                    "properties": {},
+                    "geometry": {
+                        "type": "MultiPolygon",
+                        "coordinates": [
+                            [
+                                [
+                                    [0.0, 45.0],
+                                    [15.0, 45.0],
+                                    [15.0, 55.0],
+                                    [0.0, 55.0],
+                                    [0.0, 45.0],
+                                ]
+                            ],
+                        ],
+                    },
+                },
+            ],
+        }
+        path = tmp_path / "area.geojson"
+        path.write_text(json.dumps(document), encoding="utf-8")
+
+        prepared = load_geojson_polygon(str(path))
+
+        assert prepared.part_count == 2
+        assert prepared.contains((51.5, -114.5)) == True  # Calgary area
+        assert prepared.contains((51.05011, -114.08529)) == False  # In the hole
+        assert prepared.contains((52.5, 13.4)) == True  # Berlin
+        assert prepared.contains((51.5, -0.1)) == False  # London
+
+    def test_load_geojson_skips_non_polygon_members(self, tmp_path):
+        """Test points and lines are skipped, including in nested collections."""
+        square = [[[0.0, 0.0], [2.0, 0.0], [2.0, 2.0], [0.0, 2.0], [0.0, 0.0]]]
+        document = {
+            "type": "FeatureCollection",
+            "features": [
+                {
+                    "type": "Feature",
+                    "geometry": {"type": "Point", "coordinates": [5, 5]},
+                },
+                {
+                    "type": "Feature",
+                    "geometry": {
+                        "type": "GeometryCollection",
+                        "geometries": [
+                            {"type": "LineString", "coordinates": [[0, 0], [1, 1]]},
+                            {"type": "Polygon", "coordinates": square},
+                        ],
+                    },
+                },
+                {"type": "Feature", "geometry": None},
+            ],
+        }
+        path = tmp_path / "mixed.geojson"
+        path.write_text(json.dumps(document), encoding="utf-8")
+
+        prepared = load_geojson_polygon(str(path))
+
+        assert prepared.part_count == 1
+        assert prepared.contains((1.0, 1.0)) == True
+        assert prepared.contains((3.0, 1.0)) == False
+
+    def test_load_geojson_rejects_other_geometries(self, tmp_path):
+        """Test that non-polygon geometry raises a ValueError."""
+        path = tmp_path / "point.geojson"
+        path.write_text(json.dumps({"type": "Point", "coordinates": [0, 0]}))
+
+        with pytest.raises(ValueError):
+            load_geojson_polygon(str(path))
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
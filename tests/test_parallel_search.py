@@ -0,0 +1,161 @@
+import os
+import random
+import sys
+from multiprocessing import shared_memory
+
+import pytest  # type: ignore
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from src.models.image_metadata import ImageMetadata
+from src.models.search_criteria import SearchCriteria
+from src.services.parallel_search import CriteriaPlan
+from src.services.search_engine import SearchEngine
+
+
+def make_images(count, seed=3):
+    rng = random.Random(seed)
+    images = []
+    for i in range(count):
+        fields = {"Filename": f"img_{i}.jpg"}
+        if rng.random() < 0.8:
+            fields["DPI"] = rng.choice(["72", "150", "300", "n/a"])
+        if rng.random() < 0.5:
+            fields["Favorite"] = rng.choice(["Yes", "YES", "No"])
+        if rng.random() < 0.7:
+            fields["(Center) Coordinate"] = (
+                f"{rng.uniform(40, 60):.4f}, {rng.uniform(-10, 20):.4f}"
+            )
+        tags = rng.sample(["Urban", "Dusk", "Beach", "Mountain"], rng.randint(0, 3))
+        if tags:
+            fields["User Tags"] = ", ".join(tags)
+        images.append(ImageMetadata(**fields))
+    return images
+
+
+def make_criteria(tags=(), user_tags=(), polygon=None):
+    criteria = SearchCriteria()
+    for field, op, value in tags:
+        criteria.add_tag_criterion(field, op, value)
+    for tag in user_tags:
+        criteria.add_user_tag(tag)
+    if polygon:
+        criteria.set_polygon(polygon)
+    return criteria
+
+
+POLYGON = [(45.0, 0.0), (55.0, 0.0), (55.0, 15.0), (45.0, 15.0)]
+
+CRITERIA = [
+    make_criteria(),
+    make_criteria(tags=[("Favorite", "=", "yes")]),
+    make_criteria(tags=[("DPI", ">=", "150"), ("Favorite", "=", "Yes")]),
+    make_criteria(tags=[("DPI", "<", "100")], user_tags=["urban", "Dusk"]),
+    make_criteria(polygon=POLYGON),
+    make_criteria(tags=[("DPI", ">", "abc")]),
+    make_criteria(tags=[("Favorite", "=", "Maybe")]),
+    make_criteria(user_tags=["Nonexistent"]),
+]
+
+
+@pytest.fixture(scope="module")
+def engines():
+    images = make_images(2000)
+    parallel = SearchEngine(images, workers=3, parallel_threshold=100)
+    yield SearchEngine(images), parallel
+    parallel.close()
+
+
+class TestParallelSearch:
+    """Test cases for shared-memory parallel scans."""
+
+    @pytest.mark.parametrize("criteria", CRITERIA)
+    def test_process_pool_matches_serial_search(self, engines, criteria):
+        """Test a real process pool returns the serial results in order."""
+        serial, parallel = engines
+        assert parallel.search(criteria) == serial.search(criteria)
+
+    def test_chunks_without_a_required_value_are_skipped(self):
+        """Test values that only occur in some chunks resolve per chunk."""
+        images = make_images(400)
+        images[-1] = ImageMetadata(Filename="rare.jpg", Favorite="Rare")
+        engine = SearchEngine(images, workers=2, parallel_threshold=100)
+        criteria = make_criteria(tags=[("Favorite", "=", "rare")])
+        try:
+            assert engine.search(criteria) == [images[-1]]
+
+            store = engine._column_store
+            plan = CriteriaPlan(criteria, store, [])
+            skipped = [plan.skips_chunk(i) for i in range(len(store.chunks))]
+            assert skipped == [True] * (len(store.chunks) - 1) + [False]
+        finally:
+            engine.close()
+
+    def test_tag_only_scans_run_in_parallel_above_threshold(self):
+        """Test multi-predicate tag queries use the pool on a fresh engine."""
+        images = make_images(500)
+        engine = SearchEngine(images, workers=2, parallel_threshold=100)
+        criteria = make_criteria(
+            tags=[("DPI", ">=", "150"), ("Favorite", "=", "Yes")], user_tags=["Urban"]
+        )
+        try:
+            results = engine.search(criteria)
+
+            assert results == SearchEngine(images).search(criteria)
+            assert engine._scan_pool is not None
+            assert set(engine._column_store.segments) == {
+                "num:DPI",
+                "eq:Favorite",
+                "tags",
+            }
+        finally:
+            engine.close()
+
+    def test_pool_and_columns_reused_across_searches(self):
+        """Test later searches reuse the worker pool and attach new columns."""
+        images = make_images(500)
+        engine = SearchEngine(images, workers=2, parallel_threshold=100)
+        try:
+            engine.search(CRITERIA[1])
+            pool = engine._scan_pool
+            store = engine._column_store
+
+            # Needs new columns, which the running workers attach by name
+            results = engine.search(CRITERIA[4])
+
+            assert engine._scan_pool is pool
+            assert engine._column_store is store
+            assert results == SearchEngine(images).search(CRITERIA[4])
+        finally:
+            engine.close()
+
+        assert engine._scan_pool is None
+        assert engine._column_store is None
+
+    def test_below_threshold_runs_serially(self):
+        """Test small libraries never build shared memory columns."""
+        images = make_images(50)
+        engine = SearchEngine(images, workers=4, parallel_threshold=100)
+
+        results = engine.search(CRITERIA[1])
+
+        assert results == SearchEngine(images).search(CRITERIA[1])
+        assert engine._column_store is None
+
+    def test_close_releases_shared_memory(self):
+        """Test that closing the engine unlinks every column block."""
+        engine = SearchEngine(make_images(200), workers=2, parallel_threshold=100)
+        engine.search(CRITERIA[3])
+        names = [block.name for block in engine._column_store._blocks]
+        assert names
+
+        engine.close()
+
+        for name in names:
+            with pytest.raises(FileNotFoundError):
+                shared_memory.SharedMemory(name=name)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,209 @@
+import os
+import random
+import sys
+import pytest  # type: ignore
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from src.cli.interface import CommandLineInterface
+from src.models.image_metadata import ImageMetadata
+from src.models.search_criteria import SearchCriteria
+from src.services.geospatial import haversine_km
+from src.services.search_engine import SearchEngine
+from src.services.spatial_index import SpatialIndex
+
+
+def random_coordinates(count, seed=7):
+    rng = random.Random(seed)
+    return [
+        (rng.uniform(-90.0, 90.0), rng.uniform(-180.0, 180.0)) for _ in range(count)
+    ]
+
+
+class TestHaversine:
+    """Test cases for the haversine distance helper."""
+
+    def test_known_distance(self):
+        """Test London to Paris is roughly 344 km."""
+        assert haversine_km((51.5074, -0.1278), (48.8566, 2.3522)) == pytest.approx(
+            343.5, abs=1.0
+        )
+
+    def test_antimeridian(self):
+        """Test points either side of the antimeridian are close together."""
+        assert haversine_km((0.0, 179.9), (0.0, -179.9)) == pytest.approx(22.2, abs=0.1)
+
+
+class TestSpatialIndex:
+    """Test cases for radius and nearest-neighbour queries."""
+
+    def test_within_radius_matches_brute_force(self):
+        """Test radius results and ordering against a linear scan."""
+        coords = random_coordinates(2000)
+        index = SpatialIndex(coords)
+
+        for lat, lon, radius in [
+            (51.0, -114.0, 1500.0),
+            (0.0, 179.0, 800.0),
+            (89.0, 0.0, 2000.0),
+        ]:
+            expected = sorted(
+                (haversine_km((lat, lon), c), i)
+                for i, c in enumerate(coords)
+                if haversine_km((lat, lon), c) <= radius
+            )
+            assert index.within_radius(lat, lon, radius) == expected
+
+    def test_nearest_matches_brute_force(self):
+        """Test k-nearest results against a linear scan."""
+        coords = random_coordinates(2000)
+        index = SpatialIndex(coords)
+
+        for lat, lon in [(35.0, 139.0), (-33.0, 151.0), (10.0, -179.5)]:
+            expected = sorted(
+                (haversine_km((lat, lon), c), i) for i, c in enumerate(coords)
+            )
+            assert index.nearest(lat, lon, 25) == expected[:25]
+
+    def test_nearest_with_max_distance(self):
+        """Test nearest stops at the maximum distance."""
+        coords = [(0.0, 0.0), (0.0, 0.1), (0.0, 1.0), (0.0, 5.0)]
+        index = SpatialIndex(coords)
+
+        results = index.nearest(0.0, 0.0, 10, max_km=120.0)
+        assert [image_id for _, image_id in results] == [0, 1, 2]
+
+    def test_antimeridian_neighbours(self):
+        """Test that neighbours across the antimeridian are found first."""
+        coords = [(0.0, -179.95), (0.0, 170.0), (0.0, 179.95), (0.0, -170.0)]
+        index = SpatialIndex(coords)
+
+        results = index.nearest(0.0, 179.99, 2)
+        assert [image_id for _, image_id in results] == [2, 0]
+        assert sorted(i for _, i in index.within_radius(0.0, 180.0, 50.0)) == [0, 2]
+
+    def test_missing_coordinates_are_skipped(self):
+        """Test that entries without coordinates keep their ids but are not indexed."""
+        index = SpatialIndex([None, (10.0, 10.0), None, (10.0, 10.5)])
+
+        assert len(index) == 2
+        assert [i for _, i in index.nearest(10.0, 10.0, 5)] == [1, 3]
+
+    def test_empty_index(self):
+        """Test queries against an empty index."""
+        index = SpatialIndex([])
+
+        assert index.within_radius(0.0, 0.0, 100.0) == []
+        assert index.nearest(0.0, 0.0, 3) == []
+
+
+class TestNearSearch:
+    """Test cases for distance queries through the SearchEngine."""
+
+    def make_images(self):
+        return [
+            ImageMetadata(
+                Filename="calgary.jpg",
+                **{"(Center) Coordinate": "51.05011, -114.08529"}
+            ),
+            ImageMetadata(
+                Filename="airdrie.jpg",
+                Favorite="Yes",
+                **{"(Center) Coordinate": "51.29, -114.01"}
+            ),
+            ImageMetadata(
+                Filename="edmonton.jpg",
+                Favorite="Yes",
+                **{"(Center) Coordinate": "53.55014, -113.46871"}
+            ),
+            ImageMetadata(Filename="unknown.jpg", Favorite="Yes"),
+        ]
+
+    def test_radius_search_ordered_by_distance(self):
+        """Test radius search returns only nearby images, nearest first."""
+        engine = SearchEngine(self.make_images())
+        criteria = SearchCriteria()
+        criteria.set_near(51.2, -114.0, radius_km=50.0)
+
+        results = engine.search(criteria)
+        assert [image.get("Filename") for image in results] == [
+            "airdrie.jpg",
+            "calgary.jpg",
+        ]
+
+    def test_nearest_applies_other_criteria(self):
+        """Test nearest returns K matches even when closer images are filtered."""
+        engine = SearchEngine(self.make_images())
+        criteria = SearchCriteria()
+        criteria.add_tag_criterion("Favorite", "=", "Yes")
+        criteria.set_near(51.05, -114.08, nearest=2)
+
+        results = engine.search(criteria)
+        assert [image.get("Filename") for image in results] == [
+            "airdrie.jpg",
+            "edmonton.jpg",
+        ]
+
+
+class TestNearArguments:
+    """Test cases for validating the distance query command line options."""
+
+    def criteria_for(self, *argv):
+        cli = CommandLineInterface()
+        return cli.create_search_criteria(cli.parser.parse_args(list(argv)))
+
+    def test_valid_arguments(self):
+        """Test a valid distance query is passed through to the criteria."""
+        criteria = self.criteria_for(
+            "--near=-90,180", "--radius", "0", "--nearest", "1"
+        )
+
+        assert criteria.near == (-90.0, 180.0)
+        assert criteria.radius_km == 0.0
+        assert criteria.nearest == 1
+
+    def test_southern_hemisphere_centre(self):
+        """Test the documented --near=LAT,LON form accepts negative latitudes."""
+        criteria = self.criteria_for("--near=-33.8,151.2", "--nearest", "3")
+
+        assert criteria.near == (-33.8, 151.2)
+        assert criteria.nearest == 3
+
+    def test_southern_hemisphere_search(self):
+        """Test a southern centre finds the closest images end to end."""
+        criteria = self.criteria_for("--near=-33.87,151.21", "--radius", "100")
+        images = [
+            ImageMetadata(
+                Filename="sydney.jpg", **{"(Center) Coordinate": "-33.8688, 151.2093"}
+            ),
+            ImageMetadata(
+                Filename="cape_town.jpg", **{"(Center) Coordinate": "-33.92, 18.42"}
+            ),
+        ]
+
+        results = SearchEngine(images).search(criteria)
+
+        assert [image.get("Filename") for image in results] == ["sydney.jpg"]
+
+    @pytest.mark.parametrize(
+        "argv",
+        [
+            ["--near", "51,-114", "--nearest", "0"],
+            ["--near", "51,-114", "--nearest", "-3"],
+            ["--near", "51,-114", "--radius", "-5"],
+            ["--near", "51,-114", "--radius", "nan"],
+            ["--near", "95,0", "--radius", "10"],
+            ["--near", "0,-180.5", "--nearest", "3"],
+            ["--near", "51", "--nearest", "3"],
+            ["--nearest", "3"],
+        ],
+    )
+    def test_invalid_arguments(self, argv):
+        """Test out-of-range or malformed distance queries raise ValueError."""
+        with pytest.raises(ValueError):
+            self.criteria_for(*argv)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])